@@ -0,0 +1,152 @@
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Deque, Dict, NamedTuple, Optional, Set, Tuple
+
+from app.models import Task
+
+
+class ChangeLog:
+    """Store version counter with a bounded log of which tasks changed.
+
+    Every write bumps ``version`` and records the task ID. Readers holding
+    an older version ask for the IDs changed since then; once the log has
+    been trimmed past that version they must assume everything changed.
+    """
+
+    def __init__(self, max_entries: int = 10_000) -> None:
+        self.version = 0
+        self._log: Deque[Tuple[int, int]] = deque(maxlen=max_entries)
+
+    def record(self, task_id: int) -> int:
+        """Record a write to ``task_id`` and return the new version."""
+        self.version += 1
+        self._log.append((self.version, task_id))
+        return self.version
+
+    def changed_since(self, version: int) -> Optional[Set[int]]:
+        """Task IDs written after ``version``, or None if the log no longer covers it."""
+        if version >= self.version:
+            return set()
+        if not self._log or self._log[0][0] > version + 1:
+            return None
+        changed = set()
+        for entry_version, task_id in reversed(self._log):
+            if entry_version <= version:
+                break
+            changed.add(task_id)
+        return changed
+
+
+class _Entry(NamedTuple):
+    task: Optional[Task]
+    size: int
+    expires_at: float
+
+
+class TaskCache:
+    """Read-through LRU cache of tasks by ID, bounded by approximate bytes.
+
+    Found tasks live for ``ttl`` seconds and 404s for ``negative_ttl``.
+    Before every read the cache compares its version with the change log
+    and drops entries written since, so it stays coherent with every write
+    recorded in that log. The log is an in-process object; caches in other
+    processes do not see it.
+    """
+
+    # Rough per-entry bookkeeping cost on top of the task's JSON size
+    ENTRY_OVERHEAD = 200
+
+    def __init__(
+        self,
+        change_log: ChangeLog,
+        max_bytes: int = 32 * 1024 * 1024,
+        ttl: float = 30.0,
+        negative_ttl: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.change_log = change_log
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.clock = clock
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.negative_hits = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries: "OrderedDict[int, _Entry]" = OrderedDict()
+        self._version = change_log.version
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _sync(self) -> None:
+        """Drop entries for tasks written since the cache last looked."""
+        if self._version == self.change_log.version:
+            return
+        changed = self.change_log.changed_since(self._version)
+        if changed is None:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            self.size = 0
+        else:
+            for task_id in changed:
+                if self._discard(task_id):
+                    self.invalidations += 1
+        self._version = self.change_log.version
+
+    def _discard(self, task_id: int) -> bool:
+        entry = self._entries.pop(task_id, None)
+        if entry is None:
+            return False
+        self.size -= entry.size
+        return True
+
+    def get(self, task_id: int, load: Callable[[int], Optional[Task]]) -> Optional[Task]:
+        """Return the task (None if it does not exist), calling ``load`` on a miss."""
+        self._sync()
+        entry = self._entries.get(task_id)
+        if entry is not None:
+            if entry.expires_at > self.clock():
+                self._entries.move_to_end(task_id)
+                if entry.task is None:
+                    self.negative_hits += 1
+                else:
+                    self.hits += 1
+                return entry.task
+            self._discard(task_id)
+
+        self.misses += 1
+        task = load(task_id)
+        self._put(task_id, task)
+        return task
+
+    def _put(self, task_id: int, task: Optional[Task]) -> None:
+        if task is None:
+            size, ttl = self.ENTRY_OVERHEAD, self.negative_ttl
+        else:
+            size, ttl = self.ENTRY_OVERHEAD + len(task.json_bytes), self.ttl
+        self._discard(task_id)
+        if size > self.max_bytes or ttl <= 0:
+            return
+        self._entries[task_id] = _Entry(task, size, self.clock() + ttl)
+        self.size += size
+        while self.size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= evicted.size
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Counters for monitoring hit rate and memory use."""
+        return {
+            "entries": len(self._entries),
+            "size_bytes": self.size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "version": self._version,
+        }
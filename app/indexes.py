@@ -0,0 +1,109 @@
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sortedcontainers import SortedList
+
+from app.models import Task, TaskStatus, SortField
+
+
+# Workflow order, so sorting by status reads todo -> in_progress -> done
+_STATUS_RANK: Dict[TaskStatus, int] = {status: rank for rank, status in enumerate(TaskStatus)}
+
+
+def sort_key(field: SortField, task: Task) -> Tuple:
+    """Index entry for a task; the trailing task ID breaks ties."""
+    if field == SortField.ID:
+        return (task.id,)
+    if field == SortField.TITLE:
+        return (task.title.casefold(), task.id)
+    if field == SortField.STATUS:
+        return (_STATUS_RANK[task.status], task.id)
+    if field == SortField.CREATED_AT:
+        return (task.created_at, task.id)
+    return (task.updated_at, task.id)
+
+
+def _window(
+    index: SortedList, lo: int, hi: int, descending: bool, offset: int, limit: Optional[int]
+) -> List[int]:
+    """Task IDs for one page of the index positions ``[lo, hi)``."""
+    count = max(hi - lo, 0)
+    start = min(offset, count)
+    stop = count if limit is None else min(count, start + limit)
+    if descending:
+        entries = index.islice(hi - stop, hi - start, reverse=True)
+    else:
+        entries = index.islice(lo + start, lo + stop)
+    return [entry[-1] for entry in entries]
+
+
+class TaskIndex:
+    """Sorted indexes over tasks, maintained incrementally on every write.
+
+    Each index is a SortedList of ``(key..., task_id)`` tuples, so inserts
+    and removals are O(log n) and a sorted page of k tasks is O(log n + k).
+    """
+
+    def __init__(self) -> None:
+        self._indexes: Dict[SortField, SortedList] = {field: SortedList() for field in SortField}
+
+    def __len__(self) -> int:
+        return len(self._indexes[SortField.ID])
+
+    def add(self, task: Task) -> None:
+        """Index a newly created task."""
+        for field, index in self._indexes.items():
+            index.add(sort_key(field, task))
+
+    def remove(self, task: Task) -> None:
+        """Drop a task from every index."""
+        for field, index in self._indexes.items():
+            index.remove(sort_key(field, task))
+
+    def replace(self, old: Task, new: Task) -> None:
+        """Re-index a task, touching only the indexes whose key changed."""
+        for field, index in self._indexes.items():
+            old_key = sort_key(field, old)
+            new_key = sort_key(field, new)
+            if old_key != new_key:
+                index.remove(old_key)
+                index.add(new_key)
+
+    def page(
+        self,
+        field: SortField,
+        descending: bool = False,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> List[int]:
+        """Return task IDs for one page of the given sort order."""
+        index = self._indexes[field]
+        return _window(index, 0, len(index), descending, offset, limit)
+
+    def _updated_bounds(
+        self, updated_after: Optional[datetime], updated_before: Optional[datetime]
+    ) -> Tuple[int, int]:
+        """Bisect the updated_at index for positions in ``[after, before)``."""
+        index = self._indexes[SortField.UPDATED_AT]
+        lo = 0 if updated_after is None else index.bisect_left((updated_after,))
+        hi = len(index) if updated_before is None else index.bisect_left((updated_before,))
+        return lo, max(lo, hi)
+
+    def updated_page(
+        self,
+        updated_after: Optional[datetime] = None,
+        updated_before: Optional[datetime] = None,
+        descending: bool = False,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> List[int]:
+        """Return one page of task IDs updated in ``[after, before)``, by updated_at."""
+        lo, hi = self._updated_bounds(updated_after, updated_before)
+        index = self._indexes[SortField.UPDATED_AT]
+        return _window(index, lo, hi, descending, offset, limit)
+
+    def updated_between(
+        self, updated_after: Optional[datetime] = None, updated_before: Optional[datetime] = None
+    ) -> List[int]:
+        """Return all task IDs updated in ``[after, before)``, oldest first."""
+        return self.updated_page(updated_after, updated_before)
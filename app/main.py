@@ -1,8 +1,24 @@
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import HTMLResponse
-from typing import Dict, List
+from fastapi import FastAPI, HTTPException, Query
+from fastapi.responses import HTMLResponse, Response
+from pydantic import TypeAdapter
+from starlette.types import Scope
+import heapq
+import threading
+from datetime import datetime, timezone
+from functools import partial
+from typing import Dict, List, Optional, Set
+from urllib.parse import parse_qs
 
-from app.models import Task, TaskCreate, TaskUpdate, TaskStatus, StatusUpdate
+from app.cache import ChangeLog, TaskCache
+from app.indexes import TaskIndex, sort_key
+from app.ratelimit import (
+    AdmissionControlMiddleware, ConcurrencyLimiter, LoopLagMonitor, RateLimiter
+)
+from app.report import TaskRollups
+from app.models import (
+    Task, TaskCreate, TaskUpdate, TaskStatus, StatusUpdate, SortField, SortOrder,
+    ReportBucket, DoneCount, TaskReport, CacheStats, utcnow
+)
 
 app = FastAPI(title="Mini Task Tracker", version="1.0.0")
 
@@ -283,7 +299,21 @@ HTML_PAGE = """
 
 # In-memory storage for tasks
 tasks_db: Dict[int, Task] = {}
+task_index: TaskIndex = TaskIndex()
+rollups: TaskRollups = TaskRollups()
+# Every write is recorded in the change log, and the get_task cache checks
+# it on each read. Both live in this process, as tasks_db does, so coherence
+# holds within one worker only
+change_log: ChangeLog = ChangeLog()
+task_cache: TaskCache = TaskCache(change_log)
+task_list_adapter: TypeAdapter = TypeAdapter(List[Task])
 task_id_counter: int = 0
+# list_tasks runs in the threadpool while writes run on the event loop.
+# Writers hold this lock while they update the store and its indexes, and
+# list_tasks holds it only while collecting tasks, so it never sees an index
+# half-updated. Encoding the response happens outside the lock.
+store_lock = threading.Lock()
+
 
 
 def get_next_id() -> int:
@@ -293,55 +323,289 @@ def get_next_id() -> int:
     return task_id_counter
 
 
+def as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Treat naive query datetimes as UTC so they compare with task timestamps."""
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+MAX_BATCH_IDS = 1000
+
+
+def parse_ids(ids: str) -> List[int]:
+    """Parse a comma-separated ``ids`` parameter, dropping duplicates."""
+    try:
+        task_ids = [int(part) for part in ids.split(",") if part.strip()]
+    except ValueError:
+        raise HTTPException(status_code=422, detail="ids must be comma-separated integers")
+    if len(task_ids) > MAX_BATCH_IDS:
+        raise HTTPException(status_code=422, detail=f"At most {MAX_BATCH_IDS} ids per request")
+    return list(dict.fromkeys(task_ids))
+
+
+FIELDS_DESCRIPTION = (
+    "Comma-separated Task fields to return, e.g. `id,status`. Fields not listed "
+    "are omitted from the response, even ones the Task schema marks as required."
+)
+
+
+def parse_fields(fields: Optional[str]) -> Optional[Set[str]]:
+    """Parse a comma-separated ``fields`` projection into Task field names."""
+    if fields is None:
+        return None
+    selected = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = selected - Task.model_fields.keys()
+    if not selected or unknown:
+        raise HTTPException(
+            status_code=422, detail=f"Unknown fields: {', '.join(sorted(unknown)) or '(none given)'}"
+        )
+    return selected
+
+
+def get_many_tasks(task_ids: List[int]) -> List[Task]:
+    """Look up several tasks at once, skipping IDs that do not exist."""
+    lookup = tasks_db.get
+    return [task for task in map(lookup, task_ids) if task is not None]
+
+
+# Stored tasks are already valid, so routes return their cached JSON bytes
+# instead of letting FastAPI re-validate and re-serialize them against
+# response_model. The decorators still declare response_model, which keeps
+# the OpenAPI schema unchanged. A field projection is encoded on the fly,
+# touching only the selected fields.
+def task_response(
+    task: Task, status_code: int = 200, fields: Optional[Set[str]] = None
+) -> Response:
+    """JSON response for a trusted task from tasks_db."""
+    if fields is None:
+        body = task.json_bytes
+    else:
+        body = task.__pydantic_serializer__.to_json(task, include=fields)
+    return Response(content=body, status_code=status_code, media_type="application/json")
+
+
+def task_list_response(tasks: List[Task], fields: Optional[Set[str]] = None) -> Response:
+    """JSON response for a list of trusted tasks from tasks_db."""
+    if fields is None:
+        body = b"[" + b",".join([task.json_bytes for task in tasks]) + b"]"
+    else:
+        body = task_list_adapter.dump_json(tasks, include={"__all__": fields})
+    return Response(content=body, media_type="application/json")
+
+
+# A fields= projection re-encodes every task instead of joining its cached
+# JSON, about 7x the CPU per task
+PROJECTION_COST_FACTOR = 7
+
+
+def list_tasks_cost(scope: Scope) -> float:
+    """Rate-limit cost of GET /tasks: 5 tokens plus one per 1000 tasks it may return.
+
+    A ``fields`` projection costs PROJECTION_COST_FACTOR times as much per task.
+    """
+    params = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+    count = len(tasks_db)
+    ids = params.get("ids")
+    if ids:
+        count = min(count, ids[0].count(",") + 1)
+    limit = params.get("limit")
+    if limit and limit[0].isdigit():
+        count = min(count, int(limit[0]))
+    per_task = PROJECTION_COST_FACTOR if params.get("fields") else 1
+    return 5 + count * per_task / 1000
+
+
+# Admission control: per-client, per-route token buckets weighted by route
+# cost, plus load shedding. The concurrency limiter caps listings, which run
+# in the threadpool; the lag monitor sheds requests that queued on the event
+# loop behind the async handlers
+rate_limiter = RateLimiter(
+    capacity=200,
+    refill_rate=100,
+    route_costs={("GET", "/tasks"): list_tasks_cost},
+)
+concurrency_limiter = ConcurrencyLimiter(max_concurrent=64, max_queue=256, max_queue_wait=0.5)
+loop_lag_monitor = LoopLagMonitor(max_lag=0.5)
+app.add_middleware(
+    AdmissionControlMiddleware,
+    rate_limiter=rate_limiter,
+    concurrency_limiter=concurrency_limiter,
+    lag_monitor=loop_lag_monitor,
+    unshed_paths={"/health"},
+)
+
+
+def insert_task(task: Task) -> None:
+    """Add a new task to the store, its indexes, the rollups and the change log."""
+    with store_lock:
+        tasks_db[task.id] = task
+        task_index.add(task)
+        rollups.task_created(task)
+        change_log.record(task.id)
+
+
 def reset_db() -> None:
     """Reset the database (useful for testing)."""
-    global tasks_db, task_id_counter
+    global tasks_db, task_index, rollups, change_log, task_cache, task_id_counter
     tasks_db = {}
+    task_index = TaskIndex()
+    rollups = TaskRollups()
+    change_log = ChangeLog()
+    task_cache = TaskCache(change_log)
     task_id_counter = 0
 
 
 @app.get("/", response_class=HTMLResponse)
-def home():
+async def home():
     """Serve the main UI page."""
     return HTML_PAGE
 
 
 @app.get("/health")
-def health_check():
+async def health_check():
     """Health check endpoint."""
     return {"status": "ok"}
 
 
+@app.get("/cache/stats", response_model=CacheStats)
+async def cache_stats() -> CacheStats:
+    """Hit, miss and eviction counters for the get_task cache."""
+    return CacheStats(**task_cache.stats())
+
+
 @app.post("/tasks", response_model=Task, status_code=201)
-def create_task(task_data: TaskCreate) -> Task:
+async def create_task(task_data: TaskCreate) -> Response:
     """Create a new task."""
     task_id = get_next_id()
+    now = utcnow()
     task = Task(
         id=task_id,
         title=task_data.title,
         description=task_data.description,
-        status=task_data.status
+        status=task_data.status,
+        created_at=now,
+        updated_at=now
     )
-    tasks_db[task_id] = task
-    return task
+    insert_task(task)
+    return task_response(task, status_code=201)
 
 
-@app.get("/tasks", response_model=List[Task])
-def list_tasks() -> List[Task]:
-    """Get all tasks."""
-    return list(tasks_db.values())
+@app.get(
+    "/tasks",
+    response_model=List[Task],
+    responses={200: {"description": "Tasks. With `fields`, each task has only the selected fields."}},
+)
+def list_tasks(
+    sort: SortField = SortField.ID,
+    order: SortOrder = SortOrder.ASC,
+    offset: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1),
+    updated_after: Optional[datetime] = None,
+    updated_before: Optional[datetime] = None,
+    ids: Optional[str] = Query(None, description="Comma-separated task IDs to fetch"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+) -> Response:
+    """Get tasks, sorted and paginated from the maintained indexes.
 
+    Unlike the O(1) routes this is a plain ``def``: a full listing, batch or
+    time window is O(n) work, so it runs in the threadpool instead of
+    blocking the event loop for every other client.
 
-@app.get("/tasks/{task_id}", response_model=Task)
-def get_task(task_id: int) -> Task:
-    """Get a specific task by ID."""
-    if task_id not in tasks_db:
+    ``updated_after`` (inclusive) and ``updated_before`` (exclusive) are
+    answered by bisecting the updated_at index rather than scanning. With
+    ``sort=updated_at`` a window is paged straight from the index; in any
+    other order the m tasks in the window are ordered, or only the first
+    ``offset + limit`` kept in a heap when ``limit`` is set.
+    ``ids`` fetches just the named tasks with one multi-key lookup, and
+    ``fields`` limits which fields are serialized.
+    """
+    selected = parse_fields(fields)
+    descending = order == SortOrder.DESC
+    updated_after = as_utc(updated_after)
+    updated_before = as_utc(updated_before)
+
+    batch = None if ids is None else parse_ids(ids)
+    # Index pages come out sorted and sliced; batches and other windows do not
+    paged = batch is None and (
+        sort == SortField.UPDATED_AT or (updated_after is None and updated_before is None)
+    )
+    with store_lock:
+        if batch is not None:
+            tasks = get_many_tasks(batch)
+        elif updated_after is None and updated_before is None:
+            task_ids = task_index.page(sort, descending, offset, limit)
+            tasks = [tasks_db[task_id] for task_id in task_ids]
+        elif paged:
+            task_ids = task_index.updated_page(
+                updated_after, updated_before, descending, offset, limit
+            )
+            tasks = [tasks_db[task_id] for task_id in task_ids]
+        else:
+            task_ids = task_index.updated_between(updated_after, updated_before)
+            tasks = [tasks_db[task_id] for task_id in task_ids]
+    if paged:
+        return task_list_response(tasks, selected)
+
+    if batch is not None:
+        if updated_after is not None:
+            tasks = [task for task in tasks if task.updated_at >= updated_after]
+        if updated_before is not None:
+            tasks = [task for task in tasks if task.updated_at < updated_before]
+
+    # A batch or time window in another sort order: only those tasks get
+    # ordered. With a limit, a heap keeps just the first offset + limit of the
+    # m tasks, O(m log k) instead of sorting all of them
+    key = partial(sort_key, sort)
+    if limit is None:
+        tasks.sort(key=key, reverse=descending)
+    else:
+        select = heapq.nlargest if descending else heapq.nsmallest
+        tasks = select(offset + limit, tasks, key=key)
+    return task_list_response(tasks[offset:], selected)
+
+
+@app.get("/tasks/report", response_model=TaskReport)
+async def task_report(
+    bucket: ReportBucket = ReportBucket.HOUR,
+    periods: int = Query(24, ge=1, le=1000),
+) -> TaskReport:
+    """Get per-status counts, tasks moved to done per period and time in status.
+
+    Served from rollups maintained by the write endpoints, so the cost does
+    not depend on how many tasks exist.
+    """
+    now = utcnow()
+    return TaskReport(
+        status_counts=rollups.status_counts,
+        bucket=bucket,
+        done_per_period=[
+            DoneCount(period_start=start, count=count)
+            for start, count in rollups.done_per_period(bucket, periods, now)
+        ],
+        average_seconds_in_status=rollups.average_seconds_in_status(now),
+    )
+
+
+@app.get(
+    "/tasks/{task_id}",
+    response_model=Task,
+    responses={200: {"description": "The task. With `fields`, only the selected fields are present."}},
+)
+async def get_task(
+    task_id: int,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+) -> Response:
+    """Get a specific task by ID, read through the task cache."""
+    selected = parse_fields(fields)
+    task = task_cache.get(task_id, tasks_db.get)
+    if task is None:
         raise HTTPException(status_code=404, detail="Task not found")
-    return tasks_db[task_id]
+    return task_response(task, fields=selected)
 
 
 @app.put("/tasks/{task_id}", response_model=Task)
-def update_task(task_id: int, task_data: TaskUpdate) -> Task:
+async def update_task(task_id: int, task_data: TaskUpdate) -> Response:
     """Update an existing task."""
     if task_id not in tasks_db:
         raise HTTPException(status_code=404, detail="Task not found")
@@ -353,14 +617,20 @@ def update_task(task_id: int, task_data: TaskUpdate) -> Task:
         id=existing_task.id,
         title=update_data.get("title", existing_task.title),
         description=update_data.get("description", existing_task.description),
-        status=update_data.get("status", existing_task.status)
+        status=update_data.get("status", existing_task.status),
+        created_at=existing_task.created_at,
+        updated_at=utcnow()
     )
-    tasks_db[task_id] = updated_task
-    return updated_task
+    with store_lock:
+        tasks_db[task_id] = updated_task
+        task_index.replace(existing_task, updated_task)
+        rollups.task_updated(existing_task, updated_task)
+        change_log.record(task_id)
+    return task_response(updated_task)
 
 
 @app.patch("/tasks/{task_id}/status", response_model=Task)
-def update_task_status(task_id: int, status_data: StatusUpdate) -> Task:
+async def update_task_status(task_id: int, status_data: StatusUpdate) -> Response:
     """Update only the status of an existing task."""
     if task_id not in tasks_db:
         raise HTTPException(status_code=404, detail="Task not found")
@@ -370,16 +640,26 @@ def update_task_status(task_id: int, status_data: StatusUpdate) -> Task:
         id=existing_task.id,
         title=existing_task.title,
         description=existing_task.description,
-        status=status_data.status
+        status=status_data.status,
+        created_at=existing_task.created_at,
+        updated_at=utcnow()
     )
-    tasks_db[task_id] = updated_task
-    return updated_task
+    with store_lock:
+        tasks_db[task_id] = updated_task
+        task_index.replace(existing_task, updated_task)
+        rollups.task_updated(existing_task, updated_task)
+        change_log.record(task_id)
+    return task_response(updated_task)
 
 
 @app.delete("/tasks/{task_id}", status_code=204)
-def delete_task(task_id: int):
+async def delete_task(task_id: int):
     """Delete a task."""
     if task_id not in tasks_db:
         raise HTTPException(status_code=404, detail="Task not found")
-    del tasks_db[task_id]
+    with store_lock:
+        task = tasks_db.pop(task_id)
+        task_index.remove(task)
+        rollups.task_deleted(task, utcnow())
+        change_log.record(task_id)
     return None
@@ -1,14 +1,39 @@
-from pydantic import BaseModel
-from typing import Optional
+from functools import cached_property
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Any, Dict, List, Optional
+from datetime import datetime, timezone
 from enum import Enum
 
 
+def utcnow() -> datetime:
+    """Current time as a timezone-aware UTC datetime."""
+    return datetime.now(timezone.utc)
+
+
 class TaskStatus(str, Enum):
     TODO = "todo"
     IN_PROGRESS = "in_progress"
     DONE = "done"
 
 
+class SortField(str, Enum):
+    ID = "id"
+    TITLE = "title"
+    STATUS = "status"
+    CREATED_AT = "created_at"
+    UPDATED_AT = "updated_at"
+
+
+class SortOrder(str, Enum):
+    ASC = "asc"
+    DESC = "desc"
+
+
+class ReportBucket(str, Enum):
+    HOUR = "hour"
+    DAY = "day"
+
+
 class TaskCreate(BaseModel):
     """Schema for creating a new task."""
     title: str
@@ -29,8 +54,55 @@ class StatusUpdate(BaseModel):
 
 
 class Task(BaseModel):
-    """Full task model with ID."""
+    """Full task model with ID and timestamps.
+
+    Frozen so the cached ``json_bytes`` can never go stale: an update
+    builds a new Task (or a ``model_copy``) instead of mutating this one.
+    """
+    model_config = ConfigDict(frozen=True)
+
     id: int
     title: str
     description: Optional[str] = None
     status: TaskStatus = TaskStatus.TODO
+    created_at: datetime = Field(default_factory=utcnow)
+    updated_at: datetime = Field(default_factory=utcnow)
+
+    @cached_property
+    def json_bytes(self) -> bytes:
+        """Serialized JSON, computed once per instance."""
+        return self.__pydantic_serializer__.to_json(self)
+
+    def model_copy(self, *, update: Optional[Dict[str, Any]] = None, deep: bool = False) -> "Task":
+        """Copy the task, dropping cached JSON that ``update`` would make stale."""
+        copied = super().model_copy(update=update, deep=deep)
+        if update:
+            copied.__dict__.pop("json_bytes", None)
+        return copied
+
+
+class DoneCount(BaseModel):
+    """Number of tasks moved to done within one hour or day."""
+    period_start: datetime
+    count: int
+
+
+class TaskReport(BaseModel):
+    """Aggregate report over all tasks."""
+    status_counts: Dict[TaskStatus, int]
+    bucket: ReportBucket
+    done_per_period: List[DoneCount]
+    average_seconds_in_status: Dict[TaskStatus, Optional[float]]
+
+
+class CacheStats(BaseModel):
+    """Counters for the task read cache."""
+    entries: int
+    size_bytes: int
+    max_bytes: int
+    hits: int
+    negative_hits: int
+    misses: int
+    evictions: int
+    invalidations: int
+    version: int
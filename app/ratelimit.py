@@ -0,0 +1,291 @@
+import asyncio
+import math
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Collection, Deque, Dict, Hashable, Optional, Tuple, Union
+
+from starlette.responses import JSONResponse
+from starlette.routing import Match
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+# A route's token cost: a constant, or a function of the request scope for
+# routes whose work depends on the data (e.g. listing everything)
+RouteCost = Union[float, Callable[[Scope], float]]
+
+
+class TokenBucket:
+    """Token bucket that refills continuously at ``rate`` tokens per second."""
+
+    __slots__ = ("capacity", "rate", "tokens", "updated")
+
+    def __init__(self, capacity: float, rate: float, now: float) -> None:
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = capacity
+        self.updated = now
+
+    def take(self, cost: float, now: float) -> float:
+        """Spend ``cost`` tokens; return 0 on success or seconds until affordable."""
+        # A request costing more than the capacity could never be admitted
+        cost = min(cost, self.capacity)
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= cost:
+            self.tokens -= cost
+            return 0.0
+        return (cost - self.tokens) / self.rate
+
+
+class RateLimiter:
+    """Per-client, per-route token buckets with route-weighted costs.
+
+    Each ``(client, route)`` pair gets its own bucket, and a request spends
+    its route's cost from it, so a full listing drains a client's budget
+    far faster than single-task reads. Idle buckets are evicted LRU-first
+    once ``max_buckets`` is reached; an evicted bucket would have refilled
+    anyway, so eviction only forgives, never penalises.
+    """
+
+    def __init__(
+        self,
+        capacity: float = 200.0,
+        refill_rate: float = 100.0,
+        route_costs: Optional[Dict[Tuple[str, str], RouteCost]] = None,
+        default_cost: float = 1.0,
+        max_buckets: int = 10_000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.route_costs = dict(route_costs or {})
+        self.default_cost = default_cost
+        self.max_buckets = max_buckets
+        self.clock = clock
+        self._buckets: "OrderedDict[Hashable, TokenBucket]" = OrderedDict()
+
+    def cost(self, method: str, route: str, scope: Optional[Scope] = None) -> float:
+        """Token cost of one request to ``method route``."""
+        cost = self.route_costs.get((method, route), self.default_cost)
+        if callable(cost):
+            return cost(scope or {})
+        return cost
+
+    def check(self, client: str, method: str, route: str, scope: Optional[Scope] = None) -> float:
+        """Charge a request; return 0 if allowed, else seconds to wait."""
+        now = self.clock()
+        key = (client, method, route)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = TokenBucket(self.capacity, self.refill_rate, now)
+            self._buckets[key] = bucket
+            if len(self._buckets) > self.max_buckets:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+        return bucket.take(self.cost(method, route, scope), now)
+
+    def reset(self) -> None:
+        """Forget all buckets (useful for testing)."""
+        self._buckets.clear()
+
+
+class ConcurrencyLimiter:
+    """Caps in-flight requests and sheds those that queue for too long.
+
+    Requests beyond ``max_concurrent`` wait in FIFO order. A request that
+    has waited ``max_queue_wait`` seconds, or arrives when ``max_queue``
+    requests are already waiting, is rejected rather than left to inflate
+    everyone else's latency.
+    """
+
+    def __init__(
+        self, max_concurrent: int = 64, max_queue: int = 256, max_queue_wait: float = 0.5
+    ) -> None:
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.max_queue_wait = max_queue_wait
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for waiter in self._waiters if not waiter.done())
+
+    async def acquire(self) -> bool:
+        """Wait for a slot; return False if the request should be shed."""
+        if self.in_flight < self.max_concurrent and not self._waiters:
+            self.in_flight += 1
+            return True
+        if self.queued >= self.max_queue:
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            # release() hands its slot straight to the waiter, so in_flight
+            # already counts this request once the future resolves
+            await asyncio.wait_for(waiter, self.max_queue_wait)
+            return True
+        except asyncio.TimeoutError:
+            # The slot may have been handed over in the same tick the wait
+            # timed out; it is ours then, and dropping it would leak it
+            return waiter.done() and not waiter.cancelled()
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+        finally:
+            if not waiter.done() or waiter.cancelled():
+                try:
+                    self._waiters.remove(waiter)
+                except ValueError:
+                    pass
+
+    def release(self) -> None:
+        """Free a slot, handing it to the oldest live waiter if there is one."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def reset(self) -> None:
+        """Drop all state (useful for testing)."""
+        self.in_flight = 0
+        self._waiters.clear()
+
+
+class LoopLagMonitor:
+    """Sheds load when requests queue on the event loop itself.
+
+    Handlers that hold the loop without awaiting make later requests pile
+    up in the loop's ready queue rather than in ``ConcurrencyLimiter``.
+    Each check schedules a probe with ``call_soon`` unless one is pending.
+    The probe only runs once everything queued before it has run. So if a
+    request is checked while the probe is still pending, that request was
+    queued behind other work, and the probe's age is how long it has been
+    waiting so far. Only that age counts towards shedding. A finished
+    probe also measures the run time of the request that scheduled it,
+    which is not waiting, so ``last_lag`` is kept for reference only.
+    """
+
+    def __init__(self, max_lag: float = 0.5) -> None:
+        self.max_lag = max_lag
+        self.last_lag = 0.0
+        self._probe_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._probe_started = 0.0
+
+    def lag(self) -> float:
+        """Seconds the current request has queued on the event loop, at least."""
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        if self._probe_loop is loop:
+            return now - self._probe_started
+        # No probe in flight on this loop (one left on a closed loop never runs)
+        self._probe_loop = loop
+        self._probe_started = now
+        loop.call_soon(self._probe_done, loop)
+        return 0.0
+
+    def check(self) -> float:
+        """Return 0 if the loop is keeping up, else the lag to report as Retry-After."""
+        lag = self.lag()
+        return lag if lag > self.max_lag else 0.0
+
+    def _probe_done(self, loop: asyncio.AbstractEventLoop) -> None:
+        if self._probe_loop is not loop:
+            return
+        self.last_lag = loop.time() - self._probe_started
+        self._probe_loop = None
+
+    def reset(self) -> None:
+        """Forget measurements (useful for testing)."""
+        self.last_lag = 0.0
+        self._probe_loop = None
+
+
+def route_template(scope: Scope) -> str:
+    """The matched route's path template, so /tasks/1 and /tasks/2 share limits."""
+    app = scope.get("app")
+    router = getattr(app, "router", None)
+    for route in getattr(router, "routes", ()):
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+    return "*"
+
+
+class AdmissionControlMiddleware:
+    """ASGI middleware applying rate limiting, then load shedding.
+
+    Rate-limited requests get 429. Requests that queued on the event loop,
+    or that queue too long for a concurrency slot, get 503. Both carry a
+    Retry-After header and are rejected before any route handler runs.
+    Paths in ``unshed_paths`` (such as a health check) are never shed, so an
+    overloaded worker is not also reported as dead.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        rate_limiter: Optional[RateLimiter] = None,
+        concurrency_limiter: Optional[ConcurrencyLimiter] = None,
+        lag_monitor: Optional[LoopLagMonitor] = None,
+        unshed_paths: Collection[str] = (),
+    ) -> None:
+        self.app = app
+        self.rate_limiter = rate_limiter
+        self.concurrency_limiter = concurrency_limiter
+        self.lag_monitor = lag_monitor
+        self.unshed_paths = frozenset(unshed_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if self.rate_limiter is not None:
+            client = scope.get("client")
+            client_id = client[0] if client else "unknown"
+            retry_after = self.rate_limiter.check(
+                client_id, scope["method"], route_template(scope), scope
+            )
+            if retry_after > 0:
+                await _reject(scope, receive, send, 429, "Rate limit exceeded", retry_after)
+                return
+
+        if scope["path"] in self.unshed_paths:
+            await self.app(scope, receive, send)
+            return
+
+        if self.lag_monitor is not None:
+            retry_after = self.lag_monitor.check()
+            if retry_after > 0:
+                await _reject(scope, receive, send, 503, "Server overloaded", retry_after)
+                return
+
+        limiter = self.concurrency_limiter
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+        if not await limiter.acquire():
+            await _reject(
+                scope, receive, send, 503, "Server overloaded", limiter.max_queue_wait
+            )
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
+
+
+async def _reject(
+    scope: Scope, receive: Receive, send: Send, status_code: int, detail: str, retry_after: float
+) -> None:
+    response = JSONResponse(
+        {"detail": detail},
+        status_code=status_code,
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+    await response(scope, receive, send)
@@ -0,0 +1,101 @@
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sortedcontainers import SortedDict
+
+from app.models import Task, TaskStatus, ReportBucket
+
+
+PERIOD_LENGTH: Dict[ReportBucket, timedelta] = {
+    ReportBucket.HOUR: timedelta(hours=1),
+    ReportBucket.DAY: timedelta(days=1),
+}
+
+
+def period_start(moment: datetime, bucket: ReportBucket) -> datetime:
+    """Truncate a timestamp to the start of its hour or day."""
+    if bucket == ReportBucket.DAY:
+        return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+class TaskRollups:
+    """Report aggregates, updated by each write instead of scanning tasks.
+
+    Every operation is O(1) apart from the O(log p) insert of a new period
+    into the done counters, and a report costs O(log p + periods), so
+    neither grows with the number of tasks. Time in status is tracked as
+    stints: a stint closes when a task leaves a status or is deleted. Open
+    stints are folded into the averages through the sum of their start
+    times, avoiding a scan.
+    """
+
+    def __init__(self) -> None:
+        self.status_counts: Dict[TaskStatus, int] = {status: 0 for status in TaskStatus}
+        self.done_counts: Dict[ReportBucket, SortedDict] = {
+            bucket: SortedDict() for bucket in ReportBucket
+        }
+        self._closed_seconds: Dict[TaskStatus, float] = {status: 0.0 for status in TaskStatus}
+        self._closed_stints: Dict[TaskStatus, int] = {status: 0 for status in TaskStatus}
+        self._open_started_sum: Dict[TaskStatus, float] = {status: 0.0 for status in TaskStatus}
+        self._stint_started: Dict[int, float] = {}
+
+    def _enter(self, task_id: int, status: TaskStatus, moment: datetime) -> None:
+        started = moment.timestamp()
+        self.status_counts[status] += 1
+        self._open_started_sum[status] += started
+        self._stint_started[task_id] = started
+        if status == TaskStatus.DONE:
+            for bucket, counts in self.done_counts.items():
+                key = period_start(moment, bucket)
+                counts[key] = counts.get(key, 0) + 1
+
+    def _leave(self, task_id: int, status: TaskStatus, moment: datetime) -> None:
+        started = self._stint_started.pop(task_id)
+        self.status_counts[status] -= 1
+        self._open_started_sum[status] -= started
+        self._closed_seconds[status] += moment.timestamp() - started
+        self._closed_stints[status] += 1
+
+    def task_created(self, task: Task) -> None:
+        """Record a new task; a task created as done counts as moved to done."""
+        self._enter(task.id, task.status, task.created_at)
+
+    def task_updated(self, old: Task, new: Task) -> None:
+        """Record an update; only a status change affects the rollups."""
+        if old.status != new.status:
+            self._leave(old.id, old.status, new.updated_at)
+            self._enter(new.id, new.status, new.updated_at)
+
+    def task_deleted(self, task: Task, moment: datetime) -> None:
+        """Record a deletion, closing the task's current stint."""
+        self._leave(task.id, task.status, moment)
+
+    def average_seconds_in_status(self, now: datetime) -> Dict[TaskStatus, Optional[float]]:
+        """Mean stint length per status, counting open stints up to ``now``."""
+        averages: Dict[TaskStatus, Optional[float]] = {}
+        now_ts = now.timestamp()
+        for status in TaskStatus:
+            open_count = self.status_counts[status]
+            stints = self._closed_stints[status] + open_count
+            if stints == 0:
+                averages[status] = None
+                continue
+            open_seconds = open_count * now_ts - self._open_started_sum[status]
+            averages[status] = (self._closed_seconds[status] + open_seconds) / stints
+        return averages
+
+    def done_per_period(
+        self, bucket: ReportBucket, periods: int, now: datetime
+    ) -> List[Tuple[datetime, int]]:
+        """Done counts for the ``periods`` periods ending with ``now``'s, oldest first.
+
+        Periods with no tasks moved to done are reported as zero.
+        """
+        step = PERIOD_LENGTH[bucket]
+        first = period_start(now, bucket) - step * (periods - 1)
+        counts = self.done_counts[bucket]
+        recorded = {key: counts[key] for key in counts.irange(minimum=first)}
+        return [
+            (first + step * i, recorded.get(first + step * i, 0)) for i in range(periods)
+        ]
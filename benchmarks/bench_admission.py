@@ -0,0 +1,144 @@
+"""Benchmark well-behaved client latency while another client abuses GET /tasks.
+
+An abusive client loops on GET /tasks as fast as it can while a well-behaved
+client fetches single tasks at a steady pace. Both run concurrently against
+the ASGI app on one event loop; the well-behaved client's latency
+percentiles are reported with admission control on and off.
+
+A second scenario fires a burst of concurrent GET /tasks requests from
+distinct clients, so rate limiting never applies, and reports how long the
+slowest request took with load shedding (the concurrency limiter and the
+event-loop lag monitor) on and off.
+
+Usage:
+    python benchmarks/bench_admission.py [--tasks 20000] [--requests 500] [--burst 300]
+"""
+import argparse
+import asyncio
+import math
+import os
+import statistics
+import sys
+import time
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app.main as tracker  # noqa: E402
+from bench_serialization import populate  # noqa: E402
+
+
+async def get(path: str, client: str) -> int:
+    """Drive one GET through the app as ``client`` and return the status code."""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "query_string": b"", "root_path": "", "headers": [(b"host", b"localhost")],
+        "client": (client, 0), "server": ("localhost", 80),
+    }
+    status = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+
+    await tracker.app(scope, receive, send)
+    return status[0]
+
+
+async def scenario(task_count: int, requests: int) -> Dict[str, float]:
+    latencies: List[float] = []
+    abuser_statuses: Dict[int, int] = {}
+    done = False
+
+    async def abuser() -> None:
+        while not done:
+            code = await get("/tasks", "10.0.0.66")
+            abuser_statuses[code] = abuser_statuses.get(code, 0) + 1
+            await asyncio.sleep(0)
+
+    async def good_client() -> None:
+        # Latency is measured from when each request was due, so time spent
+        # waiting behind the abuser's requests counts against the server
+        interval = 0.002
+        begin = time.perf_counter()
+        for i in range(requests):
+            due = begin + i * interval
+            delay = due - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            await get(f"/tasks/{i % task_count + 1}", "10.0.0.1")
+            latencies.append(time.perf_counter() - due)
+
+    abuse = asyncio.ensure_future(abuser())
+    await good_client()
+    done = True
+    await abuse
+
+    latencies.sort()
+    return {
+        "p50": statistics.median(latencies) * 1000,
+        "p99": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "abuser_ok": abuser_statuses.get(200, 0),
+        "abuser_429": abuser_statuses.get(429, 0),
+    }
+
+
+async def burst(count: int) -> Dict[str, float]:
+    """Fire ``count`` concurrent listings from distinct clients."""
+    begin = time.perf_counter()
+    finished: List[float] = []
+    statuses: Dict[int, int] = {}
+
+    async def one(i: int) -> None:
+        code = await get("/tasks", f"10.1.{i // 256}.{i % 256}")
+        statuses[code] = statuses.get(code, 0) + 1
+        finished.append(time.perf_counter() - begin)
+
+    await asyncio.gather(*(one(i) for i in range(count)))
+    return {"max": max(finished) * 1000, "ok": statuses.get(200, 0), "shed": statuses.get(503, 0)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=20_000)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--burst", type=int, default=300)
+    args = parser.parse_args()
+
+    populate(args.tasks)
+    asyncio.run(get("/tasks", "warmup"))
+    limiter = tracker.rate_limiter
+    route_costs, default_cost = limiter.route_costs, limiter.default_cost
+
+    print(f"Well-behaved GET /tasks/{{id}} latency while another client loops on "
+          f"GET /tasks ({args.tasks} tasks)")
+    print(f"  {'admission control':<18} {'p50 ms':>8} {'p99 ms':>8} {'abuser 200':>11} {'abuser 429':>11}")
+    for label, enabled in (("off", False), ("on", True)):
+        limiter.reset()
+        limiter.route_costs = route_costs if enabled else {}
+        limiter.default_cost = default_cost if enabled else 0
+        result = asyncio.run(scenario(args.tasks, args.requests))
+        print(f"  {label:<18} {result['p50']:>8.2f} {result['p99']:>8.2f} "
+              f"{result['abuser_ok']:>11} {result['abuser_429']:>11}")
+    limiter.route_costs, limiter.default_cost = route_costs, default_cost
+
+    monitor, concurrency = tracker.loop_lag_monitor, tracker.concurrency_limiter
+    max_lag, max_concurrent = monitor.max_lag, concurrency.max_concurrent
+    print(f"\nBurst of {args.burst} concurrent GET /tasks from distinct clients")
+    print(f"  {'load shedding':<18} {'slowest ms':>11} {'200':>6} {'503':>6}")
+    for label, enabled in (("off", False), ("on", True)):
+        limiter.reset()
+        monitor.reset()
+        monitor.max_lag = max_lag if enabled else math.inf
+        concurrency.max_concurrent = max_concurrent if enabled else math.inf
+        result = asyncio.run(burst(args.burst))
+        print(f"  {label:<18} {result['max']:>11.1f} {result['ok']:>6} {result['shed']:>6}")
+    monitor.max_lag, concurrency.max_concurrent = max_lag, max_concurrent
+
+
+if __name__ == "__main__":
+    main()
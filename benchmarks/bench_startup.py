@@ -0,0 +1,93 @@
+"""Cold-start benchmark: time-to-first-response for app.main:app.
+
+Each run starts a fresh interpreter, imports ``app.main`` and drives one
+request straight through the ASGI app (no server or HTTP client), so the
+numbers reflect the app's own startup cost.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 10] [--path /health]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = """
+import asyncio, json, sys, time
+start = time.perf_counter()
+from app.main import app
+imported = time.perf_counter()
+
+async def request(path):
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "query_string": b"", "root_path": "", "headers": [(b"host", b"localhost")],
+        "client": ("127.0.0.1", 0), "server": ("localhost", 80),
+    }
+    status = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+
+    await app(scope, receive, send)
+    return status[0]
+
+async def main(path):
+    before = time.perf_counter()
+    code = await request(path)
+    first = time.perf_counter()
+    await request(path)
+    second = time.perf_counter()
+    print(json.dumps({
+        "status": code,
+        "import": imported - start,
+        "first": first - before,
+        "second": second - first,
+        "ttfr": first - start,
+    }))
+
+asyncio.run(main(sys.argv[1]))
+"""
+
+
+def run_once(path: str) -> dict:
+    """Start a fresh interpreter and return its timings in seconds."""
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD, path],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--path", default="/health")
+    args = parser.parse_args()
+
+    samples = [run_once(args.path) for _ in range(args.runs)]
+    print(f"GET {args.path} over {args.runs} cold starts (median / min, ms)")
+    for key, label in (
+        ("import", "import app.main"),
+        ("first", "first response"),
+        ("second", "warm response"),
+        ("ttfr", "time to first response"),
+    ):
+        values = [sample[key] * 1000 for sample in samples]
+        print(f"  {label:<24} {statistics.median(values):>8.2f} {min(values):>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Import-time breakdown for app.main.
+
+Runs ``python -X importtime -c "import app.main"`` in a fresh interpreter and
+summarises the output by top-level package and by slowest module.
+
+Usage:
+    python benchmarks/importtime.py [--top 15]
+"""
+import argparse
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def collect(target: str = "app.main") -> List[Tuple[str, int, int]]:
+    """Return ``(module, self_us, cumulative_us)`` for every import of ``target``."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        rows.append((module.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def by_package(rows: List[Tuple[str, int, int]]) -> Dict[str, int]:
+    """Sum self time per top-level package."""
+    totals: Dict[str, int] = defaultdict(int)
+    for module, self_us, _ in rows:
+        totals[module.split(".")[0]] += self_us
+    return totals
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--top", type=int, default=15, help="rows to show per table")
+    args = parser.parse_args()
+
+    rows = collect()
+    total_us = sum(self_us for _, self_us, _ in rows)
+    print(f"Total import time: {total_us / 1000:.1f} ms across {len(rows)} modules\n")
+
+    print(f"{'package':<30} {'self ms':>9} {'share':>7}")
+    packages = sorted(by_package(rows).items(), key=lambda item: item[1], reverse=True)
+    for package, self_us in packages[:args.top]:
+        print(f"{package:<30} {self_us / 1000:>9.1f} {self_us / total_us:>7.1%}")
+
+    print(f"\n{'module':<45} {'self ms':>9} {'cumulative ms':>14}")
+    for module, self_us, cumulative_us in sorted(rows, key=lambda row: row[1], reverse=True)[:args.top]:
+        print(f"{module:<45} {self_us / 1000:>9.1f} {cumulative_us / 1000:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+import pytest
+
+from app.main import loop_lag_monitor, rate_limiter, reset_db
+
+
+class FakeClock:
+    """A clock that only moves when a test sets ``now``."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def clean_db():
+    """Reset the database and admission control state around each test."""
+    reset_db()
+    rate_limiter.reset()
+    loop_lag_monitor.reset()
+    yield
+    reset_db()
+    rate_limiter.reset()
+    loop_lag_monitor.reset()
+
+
+@pytest.fixture
+def clock():
+    """A FakeClock starting at 0."""
+    return FakeClock()
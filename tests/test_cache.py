@@ -0,0 +1,139 @@
+from fastapi.testclient import TestClient
+
+from app.cache import ChangeLog, TaskCache
+from app.main import app
+from app.models import Task
+
+client = TestClient(app)
+
+
+def make_store(*task_ids):
+    return {task_id: Task(id=task_id, title=f"Task {task_id}") for task_id in task_ids}
+
+
+class TestChangeLog:
+    """Unit tests for the store version counter."""
+
+    def test_changed_since(self):
+        """Returns IDs written after a version."""
+        log = ChangeLog()
+        log.record(1)
+        log.record(2)
+        log.record(1)
+        assert log.version == 3
+        assert log.changed_since(1) == {1, 2}
+        assert log.changed_since(3) == set()
+
+    def test_trimmed_log(self):
+        """Versions older than the retained log report unknown changes."""
+        log = ChangeLog(max_entries=2)
+        for task_id in (1, 2, 3):
+            log.record(task_id)
+        assert log.changed_since(0) is None
+        assert log.changed_since(1) == {2, 3}
+
+
+class TestTaskCache:
+    """Unit tests for the read-through task cache."""
+
+    def test_hit_after_miss(self):
+        """The second read of a task is served from the cache."""
+        store = make_store(1)
+        cache = TaskCache(ChangeLog())
+        assert cache.get(1, store.get).title == "Task 1"
+        assert cache.get(1, store.get).title == "Task 1"
+        assert (cache.misses, cache.hits) == (1, 1)
+
+    def test_negative_entries_expire(self, clock):
+        """404s are cached briefly, then reloaded."""
+        store = {}
+        cache = TaskCache(ChangeLog(), negative_ttl=1.0, clock=clock)
+        assert cache.get(1, store.get) is None
+        assert cache.get(1, store.get) is None
+        assert cache.negative_hits == 1
+        store.update(make_store(1))
+        clock.now = 1.5
+        assert cache.get(1, store.get).id == 1
+
+    def test_ttl_expiry(self, clock):
+        """Found tasks are reloaded after their TTL."""
+        store = make_store(1)
+        cache = TaskCache(ChangeLog(), ttl=10, clock=clock)
+        cache.get(1, store.get)
+        clock.now = 11
+        cache.get(1, store.get)
+        assert cache.misses == 2
+
+    def test_change_log_invalidates(self):
+        """A write recorded in the change log drops the cached task."""
+        log = ChangeLog()
+        store = make_store(1, 2)
+        cache = TaskCache(log)
+        cache.get(1, store.get)
+        cache.get(2, store.get)
+        store[1] = Task(id=1, title="Renamed")
+        log.record(1)
+        assert cache.get(1, store.get).title == "Renamed"
+        assert cache.get(2, store.get).title == "Task 2"
+        assert cache.invalidations == 1
+        assert cache.hits == 1
+
+    def test_trimmed_log_clears_cache(self):
+        """If the log no longer covers the cache's version, everything is dropped."""
+        log = ChangeLog(max_entries=1)
+        store = make_store(1, 2)
+        cache = TaskCache(log)
+        cache.get(1, store.get)
+        log.record(5)
+        log.record(6)
+        cache.get(2, store.get)
+        assert cache.invalidations == 1
+        assert len(cache) == 1
+
+    def test_evicts_least_recently_used_by_size(self):
+        """The cache stays under max_bytes, evicting the coldest task first."""
+        store = make_store(1, 2, 3)
+        entry_size = TaskCache.ENTRY_OVERHEAD + len(store[1].json_bytes)
+        cache = TaskCache(ChangeLog(), max_bytes=entry_size * 2)
+        cache.get(1, store.get)
+        cache.get(2, store.get)
+        cache.get(1, store.get)
+        cache.get(3, store.get)
+        assert cache.evictions == 1
+        assert cache.size <= cache.max_bytes
+        cache.get(1, store.get)
+        assert cache.hits == 2
+        cache.get(2, store.get)
+        assert cache.misses == 4
+
+
+class TestGetTaskCaching:
+    """Tests for the cache in front of GET /tasks/{id}."""
+
+    def test_repeated_reads_hit_cache(self):
+        """Reading a task twice registers a miss then a hit."""
+        client.post("/tasks", json={"title": "Task"})
+        client.get("/tasks/1")
+        client.get("/tasks/1")
+        stats = client.get("/cache/stats").json()
+        assert stats["misses"] == 1
+        assert stats["hits"] == 1
+        assert stats["entries"] == 1
+        assert stats["size_bytes"] > 0
+
+    def test_writes_invalidate(self):
+        """PUT, PATCH and DELETE are visible on the next read."""
+        client.post("/tasks", json={"title": "Task"})
+        client.get("/tasks/1")
+        client.put("/tasks/1", json={"title": "Renamed"})
+        assert client.get("/tasks/1").json()["title"] == "Renamed"
+        client.patch("/tasks/1/status", json={"status": "done"})
+        assert client.get("/tasks/1").json()["status"] == "done"
+        client.delete("/tasks/1")
+        assert client.get("/tasks/1").status_code == 404
+
+    def test_create_invalidates_cached_404(self):
+        """A cached 404 does not hide a task created afterwards."""
+        assert client.get("/tasks/1").status_code == 404
+        client.post("/tasks", json={"title": "Task"})
+        assert client.get("/tasks/1").status_code == 200
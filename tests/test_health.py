@@ -1,3 +1,7 @@
+import os
+import subprocess
+import sys
+
 from fastapi.testclient import TestClient
 from app.main import app
 
@@ -7,3 +11,19 @@ def test_health():
     response = client.get("/health")
     assert response.status_code == 200
     assert response.json()["status"] == "ok"
+
+
+def test_openapi_schema_built_lazily():
+    """Importing the app does not generate the OpenAPI schema."""
+    result = subprocess.run(
+        [sys.executable, "-c", "from app.main import app; assert app.openapi_schema is None"],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    assert result.returncode == 0
+
+
+def test_openapi_schema_available_on_first_access():
+    """GET /openapi.json still serves the full schema."""
+    response = client.get("/openapi.json")
+    assert response.status_code == 200
+    assert "/tasks/{task_id}" in response.json()["paths"]
@@ -0,0 +1,276 @@
+import asyncio
+import math
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app.main as tracker
+from app.main import app, loop_lag_monitor, rate_limiter
+from app.models import Task
+from app.ratelimit import ConcurrencyLimiter, LoopLagMonitor, RateLimiter
+
+client = TestClient(app)
+
+
+class TestRateLimiter:
+    """Unit tests for the token-bucket rate limiter."""
+
+    def test_burst_then_reject(self, clock):
+        """A client can spend its capacity, then must wait for refill."""
+        limiter = RateLimiter(capacity=3, refill_rate=1, clock=clock)
+        assert [limiter.check("a", "GET", "/x") for _ in range(3)] == [0, 0, 0]
+        assert limiter.check("a", "GET", "/x") == pytest.approx(1.0)
+        clock.now = 1.0
+        assert limiter.check("a", "GET", "/x") == 0
+
+    def test_route_cost_weighting(self, clock):
+        """Expensive routes drain the bucket proportionally faster."""
+        limiter = RateLimiter(
+            capacity=10, refill_rate=1, route_costs={("GET", "/list"): 5}, clock=clock
+        )
+        assert limiter.check("a", "GET", "/list") == 0
+        assert limiter.check("a", "GET", "/list") == 0
+        assert limiter.check("a", "GET", "/list") == pytest.approx(5.0)
+
+    def test_buckets_are_per_client_and_route(self, clock):
+        """Exhausting one client's route leaves other clients and routes alone."""
+        limiter = RateLimiter(capacity=1, refill_rate=1, clock=clock)
+        assert limiter.check("a", "GET", "/x") == 0
+        assert limiter.check("a", "GET", "/x") > 0
+        assert limiter.check("b", "GET", "/x") == 0
+        assert limiter.check("a", "GET", "/y") == 0
+
+    def test_callable_cost_and_cap(self, clock):
+        """Costs may depend on the request and are capped at the capacity."""
+        limiter = RateLimiter(
+            capacity=10, refill_rate=1, route_costs={("GET", "/x"): lambda scope: 50},
+            clock=clock,
+        )
+        assert limiter.check("a", "GET", "/x", {}) == 0
+        assert limiter.check("a", "GET", "/x", {}) == pytest.approx(10.0)
+
+    def test_idle_buckets_evicted(self, clock):
+        """The bucket table is bounded; evicted clients start with a full bucket."""
+        limiter = RateLimiter(capacity=1, refill_rate=1, max_buckets=2, clock=clock)
+        limiter.check("a", "GET", "/x")
+        limiter.check("b", "GET", "/x")
+        limiter.check("c", "GET", "/x")
+        assert limiter.check("a", "GET", "/x") == 0
+
+
+class TestConcurrencyLimiter:
+    """Unit tests for queueing and load shedding."""
+
+    def test_sheds_after_queue_wait(self):
+        """A request queued longer than max_queue_wait is rejected."""
+        async def scenario():
+            limiter = ConcurrencyLimiter(max_concurrent=1, max_queue_wait=0.01)
+            assert await limiter.acquire()
+            assert not await limiter.acquire()
+            limiter.release()
+            assert await limiter.acquire()
+            assert limiter.in_flight == 1
+
+        asyncio.run(scenario())
+
+    def test_release_hands_slot_to_waiter(self):
+        """A queued request proceeds as soon as a slot frees up."""
+        async def scenario():
+            limiter = ConcurrencyLimiter(max_concurrent=1, max_queue_wait=1.0)
+            assert await limiter.acquire()
+            waiting = asyncio.ensure_future(limiter.acquire())
+            await asyncio.sleep(0)
+            assert limiter.queued == 1
+            limiter.release()
+            assert await waiting
+            assert limiter.in_flight == 1
+            limiter.release()
+            assert limiter.in_flight == 0
+
+        asyncio.run(scenario())
+
+    def test_handoff_racing_timeout_keeps_slot(self):
+        """A slot handed over as the wait times out is used, not leaked."""
+        async def scenario():
+            limiter = ConcurrencyLimiter(max_concurrent=1, max_queue_wait=0.05)
+            assert await limiter.acquire()
+            waiting = asyncio.ensure_future(limiter.acquire())
+            await asyncio.sleep(0)
+            asyncio.get_running_loop().call_later(0.04, limiter.release)
+            # Block the loop past both deadlines so they fire in the same tick
+            time.sleep(0.1)
+            assert await waiting
+            assert limiter.in_flight == 1
+            limiter.release()
+            assert limiter.in_flight == 0
+            assert await limiter.acquire()
+
+        asyncio.run(scenario())
+
+    def test_full_queue_rejects_immediately(self):
+        """Requests beyond max_queue are shed without waiting."""
+        async def scenario():
+            limiter = ConcurrencyLimiter(max_concurrent=1, max_queue=0, max_queue_wait=10)
+            assert await limiter.acquire()
+            assert not await limiter.acquire()
+
+        asyncio.run(scenario())
+
+
+class TestLoopLagMonitor:
+    """Unit tests for event-loop lag measurement."""
+
+    def test_blocked_loop_reports_lag(self):
+        """A request checked behind a pending probe reports how long it queued."""
+        async def scenario():
+            monitor = LoopLagMonitor(max_lag=0.02)
+            assert monitor.check() == 0
+            time.sleep(0.05)
+            assert monitor.check() >= 0.05
+            await asyncio.sleep(0)
+            assert monitor.last_lag >= 0.05
+
+        asyncio.run(scenario())
+
+    def test_finished_probe_does_not_shed(self):
+        """Once the loop catches up, a slow request that has finished does not shed the next one."""
+        async def scenario():
+            monitor = LoopLagMonitor(max_lag=0.02)
+            monitor.check()
+            time.sleep(0.05)
+            await asyncio.sleep(0)
+            assert monitor.last_lag >= 0.05
+            assert monitor.check() == 0
+
+        asyncio.run(scenario())
+
+
+async def asgi_get(path, client_host, query_string=b""):
+    """Drive one GET through the app and return its status and headers."""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "query_string": query_string, "root_path": "", "headers": [(b"host", b"testserver")],
+        "client": (client_host, 0), "server": ("testserver", 80),
+    }
+    start = {}
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            start.update(message)
+
+    await app(scope, receive, send)
+    return start["status"], dict(start["headers"])
+
+
+class TestAdmissionControl:
+    """Tests for the middleware on the real app."""
+
+    def test_list_tasks_rate_limited(self, monkeypatch, clock):
+        """Hammering GET /tasks returns 429 with Retry-After once the budget is spent."""
+        monkeypatch.setattr(rate_limiter, "clock", clock)
+        # 200 tokens at 5 per listing of an empty store
+        statuses = [client.get("/tasks").status_code for _ in range(40)]
+        assert statuses == [200] * 40
+        response = client.get("/tasks")
+        assert response.status_code == 429
+        assert response.json()["detail"] == "Rate limit exceeded"
+        assert int(response.headers["Retry-After"]) >= 1
+
+    def test_list_cost_scales_with_tasks(self, monkeypatch):
+        """GET /tasks costs more as the store grows, less with a small limit."""
+        assert tracker.list_tasks_cost({"query_string": b""}) == 5
+        monkeypatch.setattr(tracker, "tasks_db", dict.fromkeys(range(2000)))
+        assert tracker.list_tasks_cost({"query_string": b""}) == 7
+        assert tracker.list_tasks_cost({"query_string": b"limit=10"}) == pytest.approx(5.01)
+
+    def test_projected_list_costs_more(self, monkeypatch):
+        """A fields= listing is charged for re-encoding every task."""
+        monkeypatch.setattr(tracker, "tasks_db", dict.fromkeys(range(2000)))
+        assert tracker.list_tasks_cost({"query_string": b"fields=id,status"}) == 5 + 2 * 7
+        assert tracker.list_tasks_cost({"query_string": b"fields=id&limit=10"}) == pytest.approx(5.07)
+
+    def test_queued_listings_are_shed(self, monkeypatch):
+        """Listings beyond the concurrency limit that queue too long get 503 with Retry-After."""
+        for task_id in range(1, 20_001):
+            tracker.insert_task(Task(id=task_id, title=f"Task {task_id}"))
+        monkeypatch.setattr(tracker.concurrency_limiter, "max_concurrent", 2)
+        monkeypatch.setattr(tracker.concurrency_limiter, "max_queue_wait", 0.01)
+        monkeypatch.setattr(loop_lag_monitor, "max_lag", math.inf)
+
+        async def scenario():
+            # Distinct clients, so only load shedding can reject them
+            return await asyncio.gather(
+                *(asgi_get("/tasks", f"10.0.0.{i}") for i in range(20))
+            )
+
+        results = asyncio.run(scenario())
+        statuses = [status for status, _ in results]
+        assert statuses.count(200) >= 2
+        assert 503 in statuses
+        shed = next(headers for status, headers in results if status == 503)
+        assert int(shed[b"retry-after"]) >= 1
+        assert tracker.concurrency_limiter.in_flight == 0
+
+    def test_listing_does_not_block_reads(self):
+        """A full listing runs off the event loop, so a single-task read finishes first."""
+        for task_id in range(1, 50_001):
+            tracker.insert_task(Task(id=task_id, title=f"Task {task_id}"))
+        finished = []
+
+        async def timed(path, client_host, query_string=b""):
+            status, _ = await asgi_get(path, client_host, query_string)
+            finished.append((path, status))
+
+        async def scenario():
+            listing = asyncio.ensure_future(timed("/tasks", "10.0.0.1", b"fields=id,status"))
+            await asyncio.sleep(0.005)
+            await timed("/tasks/1", "10.0.0.2")
+            await listing
+
+        asyncio.run(scenario())
+        assert finished == [("/tasks/1", 200), ("/tasks", 200)]
+
+    def test_slow_request_does_not_shed_next(self, monkeypatch):
+        """A slow request on an idle server does not get later requests shed."""
+        for task_id in range(1, 20_001):
+            tracker.insert_task(Task(id=task_id, title=f"Task {task_id}"))
+        monkeypatch.setattr(loop_lag_monitor, "max_lag", 0.001)
+
+        async def scenario():
+            slow = await asgi_get("/tasks", "10.0.0.1", b"fields=id,status")
+            await asyncio.sleep(0.01)
+            after = await asgi_get("/tasks/1", "10.0.0.2")
+            return slow, after
+
+        slow, after = asyncio.run(scenario())
+        assert slow[0] == 200
+        assert after[0] == 200
+
+    def test_health_is_never_shed(self):
+        """/health answers while the loop is backed up; other routes get 503."""
+        client.post("/tasks", json={"title": "Task"})
+
+        async def scenario():
+            # Hold the loop as a handler that never awaits would
+            loop_lag_monitor.check()
+            time.sleep(0.6)
+            return await asgi_get("/tasks/1", "10.0.0.1"), await asgi_get("/health", "10.0.0.2")
+
+        (status, headers), (health_status, _) = asyncio.run(scenario())
+        assert status == 503
+        assert int(headers[b"retry-after"]) >= 1
+        assert health_status == 200
+
+    def test_other_routes_unaffected_by_list_abuse(self, monkeypatch, clock):
+        """Exhausting the listing budget does not block single-task reads."""
+        monkeypatch.setattr(rate_limiter, "clock", clock)
+        client.post("/tasks", json={"title": "Task"})
+        for _ in range(40):
+            client.get("/tasks")
+        assert client.get("/tasks").status_code == 429
+        assert client.get("/tasks/1").status_code == 200
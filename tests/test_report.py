@@ -0,0 +1,147 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models import ReportBucket, Task, TaskStatus
+from app.report import TaskRollups
+
+client = TestClient(app)
+
+T0 = datetime(2024, 5, 1, 9, 30, tzinfo=timezone.utc)
+
+
+def make_task(task_id, status, created, updated=None):
+    return Task(
+        id=task_id, title=f"Task {task_id}", status=status,
+        created_at=created, updated_at=updated or created,
+    )
+
+
+def move(rollups, task, status, moment):
+    """Apply a status change to the rollups and return the new task."""
+    updated = make_task(task.id, status, task.created_at, moment)
+    rollups.task_updated(task, updated)
+    return updated
+
+
+class TestTaskRollups:
+    """Unit tests for incrementally maintained report rollups."""
+
+    def test_status_counts_follow_writes(self):
+        """Counts track creates, status changes and deletes."""
+        rollups = TaskRollups()
+        a = make_task(1, TaskStatus.TODO, T0)
+        b = make_task(2, TaskStatus.TODO, T0)
+        rollups.task_created(a)
+        rollups.task_created(b)
+        a = move(rollups, a, TaskStatus.IN_PROGRESS, T0 + timedelta(minutes=5))
+        rollups.task_deleted(b, T0 + timedelta(minutes=6))
+        assert rollups.status_counts == {
+            TaskStatus.TODO: 0, TaskStatus.IN_PROGRESS: 1, TaskStatus.DONE: 0
+        }
+
+    def test_non_status_update_is_ignored(self):
+        """Updates that keep the status do not open a new stint."""
+        rollups = TaskRollups()
+        a = make_task(1, TaskStatus.TODO, T0)
+        rollups.task_created(a)
+        move(rollups, a, TaskStatus.TODO, T0 + timedelta(minutes=5))
+        assert rollups.average_seconds_in_status(T0 + timedelta(minutes=10))[TaskStatus.TODO] == 600
+
+    def test_done_per_hour_and_day(self):
+        """Moves to done are bucketed by hour and by day."""
+        rollups = TaskRollups()
+        tasks = [make_task(i, TaskStatus.TODO, T0) for i in range(1, 4)]
+        for task in tasks:
+            rollups.task_created(task)
+        move(rollups, tasks[0], TaskStatus.DONE, T0 + timedelta(minutes=10))
+        move(rollups, tasks[1], TaskStatus.DONE, T0 + timedelta(minutes=20))
+        move(rollups, tasks[2], TaskStatus.DONE, T0 + timedelta(hours=1))
+        hour = T0.replace(minute=0)
+        now = T0 + timedelta(hours=2)
+        assert rollups.done_per_period(ReportBucket.HOUR, 3, now) == [
+            (hour, 2), (hour + timedelta(hours=1), 1), (hour + timedelta(hours=2), 0)
+        ]
+        assert rollups.done_per_period(ReportBucket.HOUR, 1, now) == [(hour + timedelta(hours=2), 0)]
+        assert rollups.done_per_period(ReportBucket.DAY, 1, now) == [(hour.replace(hour=0), 3)]
+
+    def test_stale_periods_fall_outside_window(self):
+        """Only periods within the window ending now are reported, zero-filled."""
+        rollups = TaskRollups()
+        old = make_task(1, TaskStatus.DONE, datetime(2024, 1, 1, tzinfo=timezone.utc))
+        recent = make_task(2, TaskStatus.DONE, datetime(2024, 3, 31, 12, tzinfo=timezone.utc))
+        rollups.task_created(old)
+        rollups.task_created(recent)
+        now = datetime(2024, 4, 1, 8, tzinfo=timezone.utc)
+        days = rollups.done_per_period(ReportBucket.DAY, 7, now)
+        assert len(days) == 7
+        assert days[0][0] == datetime(2024, 3, 26, tzinfo=timezone.utc)
+        assert days[-1] == (datetime(2024, 4, 1, tzinfo=timezone.utc), 0)
+        assert days[-2] == (datetime(2024, 3, 31, tzinfo=timezone.utc), 1)
+        assert sum(count for _, count in days) == 1
+
+    def test_created_as_done_counts(self):
+        """A task created as done counts as moved to done."""
+        rollups = TaskRollups()
+        rollups.task_created(make_task(1, TaskStatus.DONE, T0))
+        assert rollups.done_per_period(ReportBucket.HOUR, 1, T0) == [(T0.replace(minute=0), 1)]
+
+    def test_average_time_in_status(self):
+        """Averages combine closed stints with open stints up to now."""
+        rollups = TaskRollups()
+        a = make_task(1, TaskStatus.TODO, T0)
+        b = make_task(2, TaskStatus.TODO, T0)
+        rollups.task_created(a)
+        rollups.task_created(b)
+        # a: 60s in todo, then in_progress; b: still in todo
+        a = move(rollups, a, TaskStatus.IN_PROGRESS, T0 + timedelta(seconds=60))
+        averages = rollups.average_seconds_in_status(T0 + timedelta(seconds=180))
+        assert averages[TaskStatus.TODO] == pytest.approx((60 + 180) / 2)
+        assert averages[TaskStatus.IN_PROGRESS] == pytest.approx(120)
+        assert averages[TaskStatus.DONE] is None
+
+    def test_delete_closes_stint(self):
+        """Deleting a task closes its stint at the deletion time."""
+        rollups = TaskRollups()
+        a = make_task(1, TaskStatus.TODO, T0)
+        rollups.task_created(a)
+        rollups.task_deleted(a, T0 + timedelta(seconds=30))
+        averages = rollups.average_seconds_in_status(T0 + timedelta(hours=1))
+        assert averages[TaskStatus.TODO] == pytest.approx(30)
+
+
+class TestReportEndpoint:
+    """Tests for GET /tasks/report."""
+
+    def test_empty_report(self):
+        """The report is well-formed with no tasks."""
+        response = client.get("/tasks/report")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status_counts"] == {"todo": 0, "in_progress": 0, "done": 0}
+        assert data["bucket"] == "hour"
+        assert len(data["done_per_period"]) == 24
+        assert all(entry["count"] == 0 for entry in data["done_per_period"])
+        assert data["average_seconds_in_status"] == {"todo": None, "in_progress": None, "done": None}
+
+    def test_report_tracks_mutations(self):
+        """Creates, status changes, updates and deletes all feed the report."""
+        client.post("/tasks", json={"title": "A"})
+        client.post("/tasks", json={"title": "B"})
+        client.post("/tasks", json={"title": "C", "status": "in_progress"})
+        client.patch("/tasks/1/status", json={"status": "done"})
+        client.put("/tasks/2", json={"status": "done"})
+        client.delete("/tasks/3")
+        data = client.get("/tasks/report", params={"bucket": "day"}).json()
+        assert data["status_counts"] == {"todo": 0, "in_progress": 0, "done": 2}
+        assert data["bucket"] == "day"
+        assert len(data["done_per_period"]) == 24
+        assert data["done_per_period"][-1]["count"] == 2
+        assert data["average_seconds_in_status"]["todo"] >= 0
+
+    def test_invalid_bucket(self):
+        """Unknown bucket sizes are rejected."""
+        response = client.get("/tasks/report", params={"bucket": "week"})
+        assert response.status_code == 422
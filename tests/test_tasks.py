@@ -1,16 +1,17 @@
 import pytest
+from datetime import datetime
 from fastapi.testclient import TestClient
-from app.main import app, reset_db
+from pydantic import TypeAdapter, ValidationError
+from typing import List
+from app.main import app
+from app.models import Task
 
 client = TestClient(app)
 
 
-@pytest.fixture(autouse=True)
-def clean_db():
-    """Reset database before each test."""
-    reset_db()
-    yield
-    reset_db()
+def _ts(value: str) -> datetime:
+    """Parse an ISO timestamp from a JSON response."""
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
 
 
 class TestCreateTask:
@@ -82,6 +83,171 @@ class TestListTasks:
         assert data[1]["title"] == "Task 2"
 
 
+class TestListTasksSorting:
+    """Tests for sort/order/offset/limit on GET /tasks."""
+
+    def _create(self, *titles):
+        for title in titles:
+            client.post("/tasks", json={"title": title})
+
+    def test_sort_by_title(self):
+        """Tasks can be sorted by title, case-insensitively."""
+        self._create("banana", "Apple", "cherry")
+        response = client.get("/tasks", params={"sort": "title"})
+        assert response.status_code == 200
+        assert [t["title"] for t in response.json()] == ["Apple", "banana", "cherry"]
+
+    def test_sort_descending(self):
+        """order=desc reverses the sort order."""
+        self._create("banana", "Apple", "cherry")
+        response = client.get("/tasks", params={"sort": "title", "order": "desc"})
+        assert [t["title"] for t in response.json()] == ["cherry", "banana", "Apple"]
+
+    def test_sort_by_status_uses_workflow_order(self):
+        """Sorting by status orders todo, in_progress, done."""
+        client.post("/tasks", json={"title": "A", "status": "done"})
+        client.post("/tasks", json={"title": "B", "status": "todo"})
+        client.post("/tasks", json={"title": "C", "status": "in_progress"})
+        response = client.get("/tasks", params={"sort": "status"})
+        assert [t["status"] for t in response.json()] == ["todo", "in_progress", "done"]
+
+    def test_sort_by_updated_at_reflects_updates(self):
+        """Updating a task moves it to the end of the updated_at order."""
+        self._create("Task 1", "Task 2", "Task 3")
+        client.patch("/tasks/1/status", json={"status": "done"})
+        response = client.get("/tasks", params={"sort": "updated_at"})
+        assert [t["id"] for t in response.json()] == [2, 3, 1]
+
+    def test_sort_after_delete(self):
+        """Deleted tasks are dropped from the sorted listing."""
+        self._create("b", "a", "c")
+        client.delete("/tasks/2")
+        response = client.get("/tasks", params={"sort": "title"})
+        assert [t["title"] for t in response.json()] == ["b", "c"]
+
+    def test_pagination(self):
+        """offset and limit select a page of the sorted listing."""
+        self._create("e", "d", "c", "b", "a")
+        response = client.get("/tasks", params={"sort": "title", "offset": 1, "limit": 2})
+        assert [t["title"] for t in response.json()] == ["b", "c"]
+        response = client.get(
+            "/tasks", params={"sort": "title", "order": "desc", "offset": 1, "limit": 2}
+        )
+        assert [t["title"] for t in response.json()] == ["d", "c"]
+
+    def test_pagination_past_end(self):
+        """An offset beyond the last task returns an empty page."""
+        self._create("a")
+        response = client.get("/tasks", params={"offset": 5})
+        assert response.json() == []
+
+    def test_invalid_sort_field(self):
+        """Unknown sort fields are rejected."""
+        response = client.get("/tasks", params={"sort": "priority"})
+        assert response.status_code == 422
+
+
+class TestTaskTimestamps:
+    """Tests for created_at/updated_at on tasks."""
+
+    def test_create_sets_timestamps(self):
+        """A new task has equal created_at and updated_at."""
+        data = client.post("/tasks", json={"title": "Task"}).json()
+        assert data["created_at"] == data["updated_at"]
+
+    def test_update_bumps_updated_at(self):
+        """PUT keeps created_at and advances updated_at."""
+        created = client.post("/tasks", json={"title": "Task"}).json()
+        updated = client.put("/tasks/1", json={"title": "New"}).json()
+        assert updated["created_at"] == created["created_at"]
+        assert _ts(updated["updated_at"]) > _ts(created["updated_at"])
+
+    def test_patch_status_bumps_updated_at(self):
+        """PATCH status keeps created_at and advances updated_at."""
+        created = client.post("/tasks", json={"title": "Task"}).json()
+        updated = client.patch("/tasks/1/status", json={"status": "done"}).json()
+        assert updated["created_at"] == created["created_at"]
+        assert _ts(updated["updated_at"]) > _ts(created["updated_at"])
+
+
+class TestListTasksUpdatedRange:
+    """Tests for updated_after/updated_before on GET /tasks."""
+
+    def _setup(self):
+        """Create three tasks, then touch task 1 so it is the latest update."""
+        for title in ("c", "a", "b"):
+            client.post("/tasks", json={"title": title})
+        client.patch("/tasks/1/status", json={"status": "done"})
+        return {t["id"]: t["updated_at"] for t in client.get("/tasks").json()}
+
+    def test_updated_after_is_inclusive(self):
+        """updated_after returns tasks updated at or after the bound."""
+        stamps = self._setup()
+        response = client.get("/tasks", params={"updated_after": stamps[2]})
+        assert response.status_code == 200
+        assert [t["id"] for t in response.json()] == [1, 2, 3]
+        response = client.get("/tasks", params={"updated_after": stamps[2], "sort": "updated_at"})
+        assert [t["id"] for t in response.json()] == [2, 3, 1]
+
+    def test_updated_before_is_exclusive(self):
+        """updated_before excludes tasks updated at the bound."""
+        stamps = self._setup()
+        response = client.get("/tasks", params={"updated_before": stamps[3]})
+        assert [t["id"] for t in response.json()] == [2]
+
+    def test_updated_window(self):
+        """Both bounds together select a half-open window."""
+        stamps = self._setup()
+        response = client.get(
+            "/tasks", params={"updated_after": stamps[3], "updated_before": stamps[1]}
+        )
+        assert [t["id"] for t in response.json()] == [3]
+
+    def test_updated_range_with_other_sort(self):
+        """A time window can be combined with another sort order and paging."""
+        stamps = self._setup()
+        response = client.get(
+            "/tasks",
+            params={"updated_after": stamps[2], "sort": "title", "order": "desc", "limit": 2},
+        )
+        assert [t["title"] for t in response.json()] == ["c", "b"]
+
+    def test_updated_range_pages_match_full_order(self):
+        """Limited pages of a window in another sort order slice the full order."""
+        stamps = self._setup()
+        for order in ("asc", "desc"):
+            params = {"updated_after": stamps[2], "sort": "title", "order": order}
+            full = [t["id"] for t in client.get("/tasks", params=params).json()]
+            for offset in range(4):
+                for limit in range(1, 4):
+                    page = client.get("/tasks", params={**params, "offset": offset, "limit": limit})
+                    assert [t["id"] for t in page.json()] == full[offset:offset + limit]
+
+    def test_updated_range_descending_page(self):
+        """Sorting by updated_at inside a window pages from the index."""
+        stamps = self._setup()
+        response = client.get(
+            "/tasks",
+            params={"updated_after": stamps[2], "order": "desc", "sort": "updated_at", "offset": 1},
+        )
+        assert [t["id"] for t in response.json()] == [3, 2]
+
+    def test_naive_datetime_treated_as_utc(self):
+        """Bounds without a timezone are interpreted as UTC."""
+        stamps = self._setup()
+        naive = _ts(stamps[3]).replace(tzinfo=None).isoformat()
+        response = client.get("/tasks", params={"updated_after": naive})
+        assert [t["id"] for t in response.json()] == [1, 3]
+
+    def test_empty_window(self):
+        """A window with before <= after is empty."""
+        stamps = self._setup()
+        response = client.get(
+            "/tasks", params={"updated_after": stamps[1], "updated_before": stamps[2]}
+        )
+        assert response.json() == []
+
+
 class TestGetTask:
     """Tests for GET /tasks/{id} endpoint."""
 
@@ -275,3 +441,127 @@ class TestPatchTaskStatus:
         
         response = client.patch("/tasks/1/status", json={})
         assert response.status_code == 422
+
+
+class TestResponseSerialization:
+    """Tests for the direct JSON serialization of stored tasks."""
+
+    def test_list_body_matches_pydantic_encoding(self):
+        """GET /tasks returns exactly what response_model serialization would."""
+        client.post("/tasks", json={"title": "Task 1", "description": "First"})
+        client.post("/tasks", json={"title": "Task 2", "status": "done"})
+        response = client.get("/tasks")
+        assert response.headers["content-type"] == "application/json"
+        adapter = TypeAdapter(List[Task])
+        assert response.content == adapter.dump_json(adapter.validate_json(response.content))
+
+    def test_updated_task_is_reencoded(self):
+        """A task's cached JSON reflects the latest update."""
+        client.post("/tasks", json={"title": "Before"})
+        client.get("/tasks/1")
+        client.put("/tasks/1", json={"title": "After"})
+        assert client.get("/tasks/1").json()["title"] == "After"
+        assert client.get("/tasks").json()[0]["title"] == "After"
+
+    def test_openapi_response_schemas_unchanged(self):
+        """Routes still document Task / List[Task] responses."""
+        paths = client.get("/openapi.json").json()["paths"]
+        task_ref = {"$ref": "#/components/schemas/Task"}
+        list_schema = paths["/tasks"]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+        assert list_schema["type"] == "array"
+        assert list_schema["items"] == task_ref
+        get_schema = paths["/tasks/{task_id}"]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+        assert get_schema == task_ref
+        created = paths["/tasks"]["post"]["responses"]["201"]["content"]["application/json"]["schema"]
+        assert created == task_ref
+
+
+class TestBatchGetAndProjection:
+    """Tests for ids= batch reads and fields= projection."""
+
+    def _create(self, count):
+        for i in range(1, count + 1):
+            client.post("/tasks", json={"title": f"Task {i}", "description": "Long text"})
+
+    def test_batch_get_by_ids(self):
+        """ids returns just the named tasks, ignoring unknown IDs."""
+        self._create(5)
+        response = client.get("/tasks", params={"ids": "4,2,99"})
+        assert response.status_code == 200
+        assert [t["id"] for t in response.json()] == [2, 4]
+
+    def test_batch_get_sorted_and_deduplicated(self):
+        """A batch can be sorted, and repeated IDs appear once."""
+        self._create(3)
+        response = client.get("/tasks", params={"ids": "1,3,1", "order": "desc"})
+        assert [t["id"] for t in response.json()] == [3, 1]
+
+    def test_batch_get_with_time_window(self):
+        """A batch can be narrowed by updated_after."""
+        self._create(3)
+        client.patch("/tasks/1/status", json={"status": "done"})
+        after = client.get("/tasks/3").json()["updated_at"]
+        response = client.get("/tasks", params={"ids": "1,2,3", "updated_after": after})
+        assert [t["id"] for t in response.json()] == [1, 3]
+
+    def test_batch_get_invalid_ids(self):
+        """Non-integer IDs are rejected."""
+        response = client.get("/tasks", params={"ids": "1,two"})
+        assert response.status_code == 422
+
+    def test_batch_get_too_many_ids(self):
+        """Batches are capped."""
+        response = client.get("/tasks", params={"ids": ",".join(str(i) for i in range(1001))})
+        assert response.status_code == 422
+
+    def test_list_projection(self):
+        """fields limits each listed task to the selected fields."""
+        self._create(2)
+        response = client.get("/tasks", params={"fields": "id,status"})
+        assert response.json() == [{"id": 1, "status": "todo"}, {"id": 2, "status": "todo"}]
+
+    def test_batch_with_projection(self):
+        """ids and fields combine."""
+        self._create(3)
+        response = client.get("/tasks", params={"ids": "2", "fields": "id,title"})
+        assert response.json() == [{"id": 2, "title": "Task 2"}]
+
+    def test_get_task_projection(self):
+        """fields works on single-task reads."""
+        self._create(1)
+        response = client.get("/tasks/1", params={"fields": "status"})
+        assert response.json() == {"status": "todo"}
+
+    def test_unknown_field_rejected(self):
+        """Projecting a field Task does not have returns 422."""
+        self._create(1)
+        assert client.get("/tasks", params={"fields": "id,priority"}).status_code == 422
+        assert client.get("/tasks/1", params={"fields": ""}).status_code == 422
+
+    def test_projection_documented_in_openapi(self):
+        """The OpenAPI schema says fields= responses omit unselected fields."""
+        paths = client.get("/openapi.json").json()["paths"]
+        for path in ("/tasks", "/tasks/{task_id}"):
+            operation = paths[path]["get"]
+            fields_param = next(p for p in operation["parameters"] if p["name"] == "fields")
+            assert "omitted" in fields_param["description"]
+            assert "`fields`" in operation["responses"]["200"]["description"]
+
+
+class TestTaskModel:
+    """Tests for the immutability that protects cached task JSON."""
+
+    def test_task_is_frozen(self):
+        """Assigning to a task field is rejected."""
+        task = Task(id=1, title="a")
+        task.json_bytes
+        with pytest.raises(ValidationError):
+            task.title = "x"
+
+    def test_model_copy_serializes_new_values(self):
+        """model_copy(update=...) does not reuse the original's cached JSON."""
+        task = Task(id=1, title="a")
+        task.json_bytes
+        copied = task.model_copy(update={"title": "b"})
+        assert b'"title":"b"' in copied.json_bytes
+        assert b'"title":"a"' in task.json_bytes
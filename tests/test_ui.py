@@ -1,18 +1,9 @@
-import pytest
 from fastapi.testclient import TestClient
-from app.main import app, reset_db
+from app.main import app
 
 client = TestClient(app)
 
 
-@pytest.fixture(autouse=True)
-def clean_db():
-    """Reset database before each test."""
-    reset_db()
-    yield
-    reset_db()
-
-
 def test_home_returns_html():
     """GET / returns status 200 and Content-Type includes text/html."""
     response = client.get("/")